@@ -1,11 +1,11 @@
 import numpy as np
+from scipy.fft import fft
 from scipy.optimize import differential_evolution
 
 from .base import GravitationalWaveTransient
 from ...core.utils import logger
 from ...core.prior.base import Constraint
 from ...core.prior import DeltaFunction
-from ..utils import noise_weighted_inner_product
 
 
 class RelativeBinningGravitationalWaveTransient(GravitationalWaveTransient):
@@ -136,12 +136,21 @@ class RelativeBinningGravitationalWaveTransient(GravitationalWaveTransient):
         self.chi = chi
         self.epsilon = epsilon
         self.gamma = np.array([-5 / 3, -2 / 3, 1, 5 / 3, 7 / 3])
+        self._gamma_sign = np.sign(self.gamma)
+        self._gamma_is_negative = np.heaviside(-self.gamma, 1)
+        self._gamma_is_positive = np.heaviside(self.gamma, 1)
         self.maximum_frequency = waveform_generator.frequency_array[-1]
         self.fiducial_waveform_obtained = False
         self.check_if_bins_are_setup = False
         self.fiducial_polarizations = None
         self.per_detector_fiducial_waveforms = dict()
         self.per_detector_fiducial_waveform_points = dict()
+        self._waveform_ratio_buffers = dict()
+        self._full_waveform_buffers = dict()
+        self._duplicated_ratio_buffers = dict()
+        self._binned_frequency_offsets = dict()
+        self._data_conjugate_over_psd = dict()
+        self._masked_bin_inds = dict()
         self.set_fiducial_waveforms(self.fiducial_parameters)
         logger.info("Initial fiducial waveforms set up")
         self.setup_bins()
@@ -177,6 +186,10 @@ class RelativeBinningGravitationalWaveTransient(GravitationalWaveTransient):
         If :code:`epsilon` is too small, the naive bins can be smaller than
         the frequency spacing of the data. We require that bins are at least
         as wide as this spacing.
+
+        A single set of bins covering the frequency range of all of the
+        interferometers is used, so :code:`number_of_bins` is the same for
+        every interferometer.
         """
         frequency_array = self.waveform_generator.frequency_array
         gamma = self.gamma[:, np.newaxis]
@@ -186,38 +199,31 @@ class RelativeBinningGravitationalWaveTransient(GravitationalWaveTransient):
             maximum_frequency = max(maximum_frequency, interferometer.maximum_frequency)
             minimum_frequency = min(minimum_frequency, interferometer.minimum_frequency)
         maximum_frequency = min(maximum_frequency, self.maximum_frequency)
-        frequency_array_useful = frequency_array[
-            (frequency_array >= minimum_frequency)
-            & (frequency_array <= maximum_frequency)
-        ]
+        # the frequency array is sorted so the useful frequencies are a
+        # contiguous slice starting at first_useful_index
+        first_useful_index = np.searchsorted(frequency_array, minimum_frequency, side="left")
+        last_useful_index = np.searchsorted(frequency_array, maximum_frequency, side="right")
+        frequency_array_useful = frequency_array[first_useful_index:last_useful_index]
 
         d_alpha = self.chi * 2 * np.pi / np.abs(
-            (minimum_frequency ** gamma) * np.heaviside(-gamma, 1)
-            - (maximum_frequency ** gamma) * np.heaviside(gamma, 1)
-        )
-        d_phi = np.sum(
-            np.sign(gamma) * d_alpha * frequency_array_useful ** gamma,
-            axis=0
+            (minimum_frequency ** self.gamma) * self._gamma_is_negative
+            - (maximum_frequency ** self.gamma) * self._gamma_is_positive
         )
+        d_phi = (self._gamma_sign * d_alpha) @ (frequency_array_useful ** gamma)
         d_phi_from_start = d_phi - d_phi[0]
         number_of_bins = int(d_phi_from_start[-1] // self.epsilon)
-        bin_inds = list()
-        bin_freqs = list()
-
-        last_index = -1
-        for i in range(number_of_bins + 1):
-            bin_index = np.where(d_phi_from_start >= ((i / number_of_bins) * d_phi_from_start[-1]))[0][0]
-            if bin_index == last_index:
-                continue
-            bin_freq = frequency_array_useful[bin_index]
-            last_index = bin_index
-            bin_index = np.where(frequency_array >= bin_freq)[0][0]
-            bin_inds.append(bin_index)
-            bin_freqs.append(bin_freq)
-        self.bin_inds = np.array(bin_inds, dtype=int)
-        self.bin_sizes = np.diff(bin_inds)
+        # d_phi is monotonic so the first sample past each target phase
+        # can be found with a binary search, bins narrower than the
+        # frequency spacing are removed by dropping repeated indices
+        bin_indices = np.unique(np.searchsorted(
+            d_phi_from_start,
+            np.linspace(0, d_phi_from_start[-1], number_of_bins + 1),
+            side="left",
+        ))
+        self.bin_freqs = frequency_array_useful[bin_indices]
+        self.bin_inds = first_useful_index + bin_indices
+        self.bin_sizes = np.diff(self.bin_inds)
         self.bin_sizes[-1] += 1
-        self.bin_freqs = np.array(bin_freqs)
         self.number_of_bins = len(self.bin_inds) - 1
         logger.debug(
             f"Set up {self.number_of_bins} bins "
@@ -226,11 +232,58 @@ class RelativeBinningGravitationalWaveTransient(GravitationalWaveTransient):
         self.waveform_generator.waveform_arguments["frequency_bin_edges"] = self.bin_freqs
         self.bin_widths = self.bin_freqs[1:] - self.bin_freqs[:-1]
         self.bin_centers = (self.bin_freqs[1:] + self.bin_freqs[:-1]) / 2
+        # index of the bin containing each binned frequency
+        self._duplicated_bin_indices = np.repeat(np.arange(self.number_of_bins), self.bin_sizes)
+        # the full waveform buffers depend on the bins, they are only
+        # needed with time marginalization, otherwise they are created
+        # on first use
+        self._full_waveform_buffers = dict()
+        self._duplicated_ratio_buffers = dict()
+        self._binned_frequency_offsets = dict()
         for interferometer in self.interferometers:
             name = interferometer.name
             self.per_detector_fiducial_waveform_points[name] = (
                 self.per_detector_fiducial_waveforms[name][self.bin_inds]
             )
+            # indices of the bin edges in the masked frequency array, for
+            # the last bin make sure to include the last point in the
+            # frequency array
+            masked_frequency_array = interferometer.frequency_array[interferometer.frequency_mask]
+            masked_bin_inds = np.searchsorted(masked_frequency_array, self.bin_freqs, side="left")
+            if (
+                masked_bin_inds[-1] >= len(masked_frequency_array)
+                or not np.array_equal(masked_frequency_array[masked_bin_inds], self.bin_freqs)
+            ):
+                raise ValueError(
+                    f"The frequency bins span {self.bin_freqs[0]} Hz to "
+                    f"{self.bin_freqs[-1]} Hz, which is not covered by the "
+                    f"frequency mask of {name}. All interferometers must "
+                    "cover the full range of the bins."
+                )
+            masked_bin_inds[-1] += 1
+            self._masked_bin_inds[name] = masked_bin_inds
+            # scratch space reused by every likelihood evaluation
+            self._waveform_ratio_buffers[name] = np.empty((2, self.number_of_bins), dtype=complex)
+            if self.time_marginalization:
+                self._setup_full_waveform_buffers(interferometer)
+
+    def _setup_full_waveform_buffers(self, interferometer):
+        """
+        Allocate the scratch buffers used to reconstruct the full waveform
+        for an interferometer with the current bins.
+        """
+        name = interferometer.name
+        # offset of each binned frequency from the center of its bin
+        self._binned_frequency_offsets[name] = (
+            interferometer.frequency_array[self.bin_inds[0]:self.bin_inds[-1] + 1]
+            - np.repeat(self.bin_centers, self.bin_sizes)
+        )
+        self._full_waveform_buffers[name] = np.zeros(
+            len(interferometer.frequency_array), dtype=complex
+        )
+        self._duplicated_ratio_buffers[name] = np.empty(
+            (2, len(self._duplicated_bin_indices)), dtype=complex
+        )
 
     def set_fiducial_waveforms(self, parameters):
         parameters = parameters.copy()
@@ -253,6 +306,12 @@ class RelativeBinningGravitationalWaveTransient(GravitationalWaveTransient):
             wf = interferometer.get_detector_response(self.fiducial_polarizations, parameters)
             wf[interferometer.frequency_array > self.maximum_frequency] = 0
             self.per_detector_fiducial_waveforms[interferometer.name] = wf
+            if self.time_marginalization:
+                # used to compute the time-marginalized overlap with an FFT
+                self._data_conjugate_over_psd[interferometer.name] = (
+                    interferometer.frequency_domain_strain.conjugate()[0:-1]
+                    / interferometer.power_spectral_density_array[0:-1]
+                )
 
     def find_maximum_likelihood_parameters(self, parameter_bounds,
                                            iterations=5, maximization_kwargs=None):
@@ -288,6 +347,13 @@ class RelativeBinningGravitationalWaveTransient(GravitationalWaveTransient):
         return updated_parameters
 
     def lnlike_scipy_maximize(self, parameter_list):
+        parameter_list = np.asarray(parameter_list)
+        if parameter_list.ndim == 2:
+            # vectorized evaluation, e.g., differential_evolution with
+            # vectorized=True, each column is a set of parameters
+            return np.array([
+                self.lnlike_scipy_maximize(parameters) for parameters in parameter_list.T
+            ])
         self.parameters.update(self.get_parameter_dictionary_from_list(parameter_list))
         return -self.log_likelihood_ratio()
 
@@ -313,45 +379,51 @@ class RelativeBinningGravitationalWaveTransient(GravitationalWaveTransient):
         for interferometer in self.interferometers:
             mask = interferometer.frequency_mask
             masked_frequency_array = interferometer.frequency_array[mask]
-            masked_bin_inds = []
-            for edge in self.bin_freqs:
-                index = np.where(masked_frequency_array == edge)[0][0]
-                masked_bin_inds.append(index)
-            # For the last bin, make sure to include
-            # the last point in the frequency array
-            masked_bin_inds[-1] += 1
+            masked_bin_inds = self._masked_bin_inds[interferometer.name]
 
             masked_strain = interferometer.frequency_domain_strain[mask]
             masked_h0 = self.per_detector_fiducial_waveforms[interferometer.name][mask]
             masked_psd = interferometer.power_spectral_density_array[mask]
             duration = interferometer.duration
-            a0, b0, a1, b1 = np.zeros((4, self.number_of_bins), dtype=complex)
-
-            for i in range(self.number_of_bins):
-                start_idx = masked_bin_inds[i]
-                end_idx = masked_bin_inds[i + 1]
-                start = masked_frequency_array[start_idx]
-                stop = masked_frequency_array[end_idx]
-                idxs = slice(start_idx, end_idx)
-
-                strain = masked_strain[idxs]
-                h0 = masked_h0[idxs]
-                psd = masked_psd[idxs]
 
-                frequencies = masked_frequency_array[idxs]
-                central_frequency = (start + stop) / 2
-                delta_frequency = frequencies - central_frequency
+            # Evaluate the integrands over all bins at once and then sum
+            # the contribution from each bin with a single reduction
+            idxs = slice(masked_bin_inds[0], masked_bin_inds[-1])
+            bin_starts = masked_bin_inds[:-1] - masked_bin_inds[0]
+            delta_frequency = masked_frequency_array[idxs] - np.repeat(
+                self.bin_centers, np.diff(masked_bin_inds)
+            )
+            weighted_h0 = np.conj(masked_h0[idxs]) / masked_psd[idxs]
 
-                a0[i] = noise_weighted_inner_product(h0, strain, psd, duration)
-                b0[i] = noise_weighted_inner_product(h0, h0, psd, duration)
-                a1[i] = noise_weighted_inner_product(h0, strain * delta_frequency, psd, duration)
-                b1[i] = noise_weighted_inner_product(h0, h0 * delta_frequency, psd, duration)
+            # the integrands are written directly into a single
+            # (4, n_frequencies) array with rows a0, a1, b0, b1 so the four
+            # summary data share one reduction
+            integrands = np.empty((4, len(delta_frequency)), dtype=complex)
+            np.multiply(weighted_h0, masked_strain[idxs], out=integrands[0])
+            np.multiply(integrands[0], delta_frequency, out=integrands[1])
+            np.multiply(weighted_h0, masked_h0[idxs], out=integrands[2])
+            np.multiply(integrands[2], delta_frequency, out=integrands[3])
 
-            summary_data[interferometer.name] = (a0, a1, b0, b1)
+            summary = np.add.reduceat(integrands, bin_starts, axis=1)
+            summary *= 4 / duration
+            summary_data[interferometer.name] = summary
 
         self.summary_data = summary_data
 
     def compute_waveform_ratio_per_interferometer(self, waveform_polarizations, interferometer):
+        r0, r1 = self._compute_waveform_ratio_per_interferometer(
+            waveform_polarizations=waveform_polarizations,
+            interferometer=interferometer,
+        ).copy()
+        return [r0, r1]
+
+    def _compute_waveform_ratio_per_interferometer(self, waveform_polarizations, interferometer):
+        """
+        Compute the waveform ratio coefficients r0 and r1 for each bin.
+
+        The returned (2, number_of_bins) array is a scratch buffer that is
+        overwritten by the next call for the same interferometer.
+        """
         name = interferometer.name
         strain = interferometer.get_detector_response(
             waveform_polarizations=waveform_polarizations,
@@ -359,50 +431,93 @@ class RelativeBinningGravitationalWaveTransient(GravitationalWaveTransient):
             frequencies=self.bin_freqs,
         )
         reference_strain = self.per_detector_fiducial_waveform_points[name]
-        waveform_ratio = strain / reference_strain
+        # the detector response is a new array so the ratio and the
+        # linear coefficients can be computed in place
+        waveform_ratio = np.divide(strain, reference_strain, out=strain)
 
-        r0 = (waveform_ratio[1:] + waveform_ratio[:-1]) / 2
-        r1 = (waveform_ratio[1:] - waveform_ratio[:-1]) / self.bin_widths
+        ratios = self._waveform_ratio_buffers[name]
+        r0, r1 = ratios
+        np.add(waveform_ratio[1:], waveform_ratio[:-1], out=r0)
+        r0 *= 0.5
+        np.subtract(waveform_ratio[1:], waveform_ratio[:-1], out=r1)
+        r1 /= self.bin_widths
 
-        return [r0, r1]
+        return ratios
 
     def _compute_full_waveform(self, signal_polarizations, interferometer):
-        fiducial_waveform = self.per_detector_fiducial_waveforms[interferometer.name]
-        r0, r1 = self.compute_waveform_ratio_per_interferometer(
+        """
+        Reconstruct the full frequency-domain waveform for the given
+        polarizations, see :code:`_compute_full_waveform_from_ratios`.
+
+        The returned array is a scratch buffer that is overwritten by the
+        next call for the same interferometer.
+        """
+        ratios = self._compute_waveform_ratio_per_interferometer(
             waveform_polarizations=signal_polarizations,
             interferometer=interferometer,
         )
+        return self._compute_full_waveform_from_ratios(ratios, interferometer)
 
-        idxs = slice(self.bin_inds[0], self.bin_inds[-1] + 1)
-        duplicated_r0 = np.repeat(r0, self.bin_sizes)
-        duplicated_r1 = np.repeat(r1, self.bin_sizes)
-        duplicated_fm = np.repeat(self.bin_centers, self.bin_sizes)
+    def _compute_full_waveform_from_ratios(self, ratios, interferometer):
+        """
+        Reconstruct the full frequency-domain waveform from the waveform
+        ratio coefficients.
+
+        The returned array is a scratch buffer that is overwritten by the
+        next call for the same interferometer.
+        """
+        name = interferometer.name
+        if name not in self._full_waveform_buffers:
+            self._setup_full_waveform_buffers(interferometer)
+        fiducial_waveform = self.per_detector_fiducial_waveforms[name]
+        r0, r1 = ratios
 
-        f = interferometer.frequency_array
-        full_waveform_ratio = np.zeros(f.shape[0], dtype=complex)
-        full_waveform_ratio[idxs] = duplicated_r0 + duplicated_r1 * (f[idxs] - duplicated_fm)
-        return fiducial_waveform * full_waveform_ratio
+        idxs = slice(self.bin_inds[0], self.bin_inds[-1] + 1)
+        duplicated_r0, duplicated_r1 = self._duplicated_ratio_buffers[name]
+        # mode="clip" avoids np.take buffering the output
+        np.take(r0, self._duplicated_bin_indices, out=duplicated_r0, mode="clip")
+        np.take(r1, self._duplicated_bin_indices, out=duplicated_r1, mode="clip")
+
+        # the buffer is zero outside of the binned frequencies so only the
+        # binned region needs to be filled
+        full_waveform = self._full_waveform_buffers[name]
+        binned_waveform = full_waveform[idxs]
+        np.multiply(duplicated_r1, self._binned_frequency_offsets[name], out=binned_waveform)
+        binned_waveform += duplicated_r0
+        binned_waveform *= fiducial_waveform[idxs]
+        return full_waveform
 
     def calculate_snrs(self, waveform_polarizations, interferometer, return_array=True):
-        r0, r1 = self.compute_waveform_ratio_per_interferometer(
+        ratios = self._compute_waveform_ratio_per_interferometer(
             waveform_polarizations=waveform_polarizations,
             interferometer=interferometer,
         )
-        a0, a1, b0, b1 = self.summary_data[interferometer.name]
-        d_inner_h = np.sum(a0 * np.conjugate(r0) + a1 * np.conjugate(r1))
-        h_inner_h = np.sum(b0 * np.abs(r0) ** 2 + 2 * b1 * np.real(r0 * np.conjugate(r1)))
+        r0, r1 = ratios
+        summary_data = self.summary_data[interferometer.name]
+        # np.vdot conjugates its first argument and reduces in a single
+        # pass, the (r0, r1) and (a0, a1) rows are contiguous so d_inner_h
+        # is a single reduction
+        d_inner_h = np.vdot(ratios, summary_data[:2])
+        h_inner_h = (
+            np.vdot(r0, summary_data[2] * r0)
+            + 2 * np.vdot(r1, summary_data[3] * r0).real
+        )
         optimal_snr_squared = h_inner_h
         complex_matched_filter_snr = d_inner_h / (optimal_snr_squared ** 0.5)
 
         if return_array and self.time_marginalization:
-            full_waveform = self._compute_full_waveform(
-                signal_polarizations=waveform_polarizations,
+            # reuse the waveform ratios rather than recomputing the
+            # detector response at the bin edges
+            full_waveform = self._compute_full_waveform_from_ratios(
+                ratios=ratios,
                 interferometer=interferometer,
             )
-            d_inner_h_array = 4 / self.waveform_generator.duration * np.fft.fft(
+            # the FFT input is a temporary so it can be transformed in place
+            d_inner_h_array = 4 / self.waveform_generator.duration * fft(
                 full_waveform[0:-1]
-                * interferometer.frequency_domain_strain.conjugate()[0:-1]
-                / interferometer.power_spectral_density_array[0:-1])
+                * self._data_conjugate_over_psd[interferometer.name],
+                overwrite_x=True,
+            )
 
         else:
             d_inner_h_array = None
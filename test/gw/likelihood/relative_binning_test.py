@@ -174,6 +174,81 @@ class TestRelativeBinningLikelihood(unittest.TestCase):
         binned.parameters.update(self.test_parameters)
         self.assertFalse(np.isnan(binned.log_likelihood_ratio()))
 
+    def test_waveform_ratio_is_not_overwritten(self):
+        """
+        The public waveform ratio method should return new arrays rather
+        than the internal buffers reused between calls.
+        """
+        ifo = self.ifos[0]
+        ratios = list()
+        for chirp_mass in [12.5, 13.5]:
+            self.binned.parameters.update(self.test_parameters)
+            self.binned.parameters["chirp_mass"] = chirp_mass
+            parameters = self.binned.parameters.copy()
+            parameters.update(self.binned.get_sky_frame_parameters())
+            polarizations = self.binned.waveform_generator.frequency_domain_strain(parameters)
+            ratios.append(self.binned.compute_waveform_ratio_per_interferometer(polarizations, ifo))
+        self.assertFalse(np.allclose(ratios[0][0], ratios[1][0]))
+
+    def test_vectorized_maximization_objective_matches_single(self):
+        """
+        Passing an array of shape (n_parameters, n_points) to the
+        maximization objective should match evaluating each column.
+        """
+        self.binned.parameters_to_be_updated = ["luminosity_distance", "theta_jn"]
+        parameter_list = np.array([[1500.0, 2000.0, 2500.0], [0.2, 0.4, 0.6]])
+        vectorized = self.binned.lnlike_scipy_maximize(parameter_list)
+        single = [
+            self.binned.lnlike_scipy_maximize(parameters)
+            for parameters in parameter_list.T
+        ]
+        self.assertEqual(vectorized.shape, (3,))
+        np.testing.assert_allclose(vectorized, single)
+
+    def test_mismatched_minimum_frequency_raises_error(self):
+        """
+        The bins cover all of the interferometers, test that we raise an
+        error if an interferometer does not cover the full range of the bins.
+        """
+        ifos = deepcopy(self.ifos)
+        ifos[2].minimum_frequency = 30
+        with self.assertRaises(ValueError):
+            bilby.gw.likelihood.RelativeBinningGravitationalWaveTransient(
+                interferometers=ifos, waveform_generator=deepcopy(self.bin_wfg),
+                fiducial_parameters=self.fiducial_parameters,
+                priors=self.priors.copy(),
+                epsilon=0.05,
+            )
+
+    def test_time_marginalized_overlap_matches_binned_overlap(self):
+        """
+        The time-marginalized overlap computed from the full waveform should
+        match the binned overlap at zero time shift.
+        """
+        priors = self.priors.copy()
+        priors["geocent_time"] = bilby.core.prior.Uniform(
+            self.test_parameters["geocent_time"] - 0.1,
+            self.test_parameters["geocent_time"] + 0.1,
+        )
+        binned = bilby.gw.likelihood.RelativeBinningGravitationalWaveTransient(
+            interferometers=self.ifos, waveform_generator=deepcopy(self.bin_wfg),
+            fiducial_parameters=self.fiducial_parameters,
+            priors=priors,
+            epsilon=0.05,
+            time_marginalization=True,
+            jitter_time=False,
+        )
+        binned.parameters.update(self.test_parameters)
+        binned.parameters["geocent_time"] = self.ifos.start_time
+        parameters = binned.parameters.copy()
+        parameters.update(binned.get_sky_frame_parameters())
+        polarizations = binned.waveform_generator.frequency_domain_strain(parameters)
+        for ifo in self.ifos:
+            snrs = binned.calculate_snrs(polarizations, ifo)
+            self.assertAlmostEqual(
+                snrs.d_inner_h_array[0], np.conjugate(snrs.d_inner_h), places=8
+            )
+
 
 if __name__ == "__main__":
     unittest.main()